@@ -20,8 +20,6 @@ License: AGPL-3.0
 
 import os
 import sys
-import json
-import subprocess
 import shutil
 from pathlib import Path
 
@@ -73,6 +71,9 @@ def check_python_version():
 
 def install_python_packages():
     """Install required Python packages from requirements.txt"""
+    import hashlib
+    import subprocess
+
     print(f"\n{Colors.BOLD}Installing Python packages...{Colors.END}")
 
     requirements_file = Path(__file__).parent / "requirements.txt"
@@ -81,20 +82,31 @@ def install_python_packages():
         print(f"{Colors.RED}✗ requirements.txt not found{Colors.END}")
         return False
 
+    # Reuse downloaded/built wheels across runs; PIP_CACHE_DIR takes precedence
+    cache_dir = os.environ.get("PIP_CACHE_DIR") or str(Path.home() / ".cache" / "mp_pip")
+    requirements_hash = hashlib.sha256(requirements_file.read_bytes()).hexdigest()
+
     try:
         print(f"{Colors.CYAN}  Running: pip install -r requirements.txt{Colors.END}")
+        print(f"{Colors.CYAN}  Pip cache directory: {cache_dir}{Colors.END}")
+        print(f"{Colors.CYAN}  requirements.txt sha256: {requirements_hash}{Colors.END}")
+        # Let pip write straight to the terminal so progress is visible
         result = subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-r", str(requirements_file)],
-            capture_output=True,
-            text=True
+            [
+                sys.executable, "-m", "pip", "install",
+                "--disable-pip-version-check",
+                "--no-input",
+                "--cache-dir", cache_dir,
+                "-r", str(requirements_file)
+            ],
+            check=False
         )
 
         if result.returncode == 0:
             print(f"{Colors.GREEN}✓ Python packages installed successfully{Colors.END}")
             return True
         else:
-            print(f"{Colors.RED}✗ Failed to install Python packages{Colors.END}")
-            print(f"{Colors.YELLOW}{result.stderr}{Colors.END}")
+            print(f"{Colors.RED}✗ Failed to install Python packages (see pip output above){Colors.END}")
             return False
 
     except Exception as e:
@@ -173,7 +185,7 @@ def setup_config_file():
 
     try:
         # Copy example to config
-        shutil.copy(str(example_file), str(config_file))
+        shutil.copyfile(str(example_file), str(config_file))
         print(f"{Colors.GREEN}✓ Created config.json from example{Colors.END}")
         print(f"{Colors.CYAN}  Please edit config.json to add your settings{Colors.END}")
         return True
@@ -209,6 +221,8 @@ def setup_directory_structure():
 
 def run_configuration_wizard():
     """Interactive configuration wizard"""
+    import json
+
     print(f"\n{Colors.BOLD}Configuration Wizard{Colors.END}")
     print(f"{Colors.CYAN}{'='*60}{Colors.END}\n")
 
@@ -227,6 +241,9 @@ def run_configuration_wizard():
         print(f"{Colors.RED}Error loading config: {e}{Colors.END}")
         return False
 
+    # The wizard only replaces top-level values, so a shallow copy is enough to diff
+    original = dict(config)
+
     print(f"{Colors.YELLOW}Leave blank to keep current value{Colors.END}\n")
 
     # Basic settings
@@ -252,6 +269,11 @@ def run_configuration_wizard():
     if image_model:
         config['image_model'] = image_model
 
+    # Leave the file (and its mtime) untouched if nothing was changed
+    if config == original:
+        print(f"\n{Colors.CYAN}No changes made, configuration left as is{Colors.END}")
+        return True
+
     # Save config
     try:
         with open(config_file, 'w') as f:
@@ -12,11 +12,20 @@ License: AGPL-3.0
 """
 
 import os
+import copy
 import json
-from typing import List, Dict, Optional
+import functools
+from typing import List, Dict, Iterable, Optional
 from config import ROOT_DIR
 
+try:
+    # Optional: orjson encodes/decodes several times faster than the stdlib
+    import orjson
+except ImportError:
+    orjson = None
 
+
+@functools.lru_cache(maxsize=None)
 def get_cache_path() -> str:
     """
     Gets the path to the main cache directory.
@@ -24,6 +33,9 @@ def get_cache_path() -> str:
     The cache directory stores all persistent data for the application including
     account configurations, generated content metadata, and product information.
 
+    ROOT_DIR is fixed at import time, so this and the other path getters
+    are computed once and memoized.
+
     Returns:
         str: Absolute path to the cache directory (.mp folder)
 
@@ -34,6 +46,7 @@ def get_cache_path() -> str:
     return os.path.join(ROOT_DIR, '.mp')
 
 
+@functools.lru_cache(maxsize=None)
 def get_afm_cache_path() -> str:
     """
     Gets the path to the Affiliate Marketing cache file.
@@ -51,6 +64,7 @@ def get_afm_cache_path() -> str:
     return os.path.join(get_cache_path(), 'afm.json')
 
 
+@functools.lru_cache(maxsize=None)
 def get_twitter_cache_path() -> str:
     """
     Gets the path to the Twitter accounts cache file.
@@ -67,6 +81,7 @@ def get_twitter_cache_path() -> str:
     return os.path.join(get_cache_path(), 'twitter.json')
 
 
+@functools.lru_cache(maxsize=None)
 def get_youtube_cache_path() -> str:
     """
     Gets the path to the YouTube accounts cache file.
@@ -83,56 +98,136 @@ def get_youtube_cache_path() -> str:
     return os.path.join(get_cache_path(), 'youtube.json')
 
 
-def _ensure_cache_file_exists(cache_path: str, default_structure: Dict) -> None:
+# Shared default structures for empty cache files. Never mutate these;
+# _read_cache_file hands out fresh copies when it falls back to them.
+_ACCOUNTS_DEFAULT: Dict = {"accounts": []}
+_PRODUCTS_DEFAULT: Dict = {"products": []}
+
+# Maps each account provider to the getter for its cache file
+_PROVIDER_PATHS = {
+    "twitter": get_twitter_cache_path,
+    "youtube": get_youtube_cache_path,
+}
+
+
+def _get_account_cache_path(provider: str) -> str:
+    """
+    Resolves the cache file that stores accounts for a provider.
+
+    Args:
+        provider (str): The provider ("twitter" or "youtube")
+
+    Returns:
+        str: Absolute path to the provider's cache file
+
+    Raises:
+        ValueError: If provider is not "twitter" or "youtube"
+    """
+    try:
+        return _PROVIDER_PATHS[provider]()
+    except KeyError:
+        raise ValueError(f"Invalid provider: {provider}. Must be 'twitter' or 'youtube'") from None
+
+
+def _json_dump_kwargs() -> Dict:
     """
-    Ensures a cache file exists with the proper structure.
+    Builds the keyword arguments used when serializing cache files.
+
+    Cache files are written compactly since they are only read by the
+    application. Set the MP_PRETTY_CACHE environment variable to get
+    indented, human-readable output while debugging.
+
+    Returns:
+        Dict: Keyword arguments for json.dump
+    """
+    if os.environ.get('MP_PRETTY_CACHE'):
+        return {'ensure_ascii': False, 'indent': 2}
+    return {'ensure_ascii': False, 'separators': (',', ':')}
+
+
+def _loads(raw: bytes) -> object:
+    """
+    Decodes cache file contents, using orjson when it is installed.
+
+    Args:
+        raw (bytes): Raw UTF-8 encoded JSON
+
+    Returns:
+        object: The decoded JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(data: Dict) -> bytes:
+    """
+    Encodes cache data to UTF-8 JSON bytes, using orjson when it is installed.
+
+    Args:
+        data (Dict): Data to encode
+
+    Returns:
+        bytes: The encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if os.environ.get('MP_PRETTY_CACHE'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, **_json_dump_kwargs()).encode('utf-8')
+
+
+def _create_cache_file(cache_path: str, default_structure: Dict) -> None:
+    """
+    Creates a missing cache file with the default structure.
 
-    If the file doesn't exist, creates it with the default structure.
     This is an internal helper function.
 
     Args:
         cache_path (str): Path to the cache file
-        default_structure (Dict): Default JSON structure to use if file doesn't exist
+        default_structure (Dict): Default JSON structure to write
 
     Returns:
         None
     """
-    if not os.path.exists(cache_path):
-        # Ensure the cache directory exists
-        cache_dir = os.path.dirname(cache_path)
-        if not os.path.exists(cache_dir):
-            os.makedirs(cache_dir)
+    # Ensure the cache directory exists
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
 
-        # Create the file with default structure
-        with open(cache_path, 'w', encoding='utf-8') as file:
-            json.dump(default_structure, file, indent=4)
+    # Create the file with default structure
+    with open(cache_path, 'wb') as file:
+        file.write(_dumps(default_structure))
 
 
 def _read_cache_file(cache_path: str, default_structure: Dict) -> Dict:
     """
     Safely reads a cache file with error handling.
 
+    A missing file is created with the default structure.
+
     Args:
         cache_path (str): Path to the cache file
-        default_structure (Dict): Default structure to return on error
+        default_structure (Dict): Default structure to return on error.
+            It is never returned as-is, so shared constants are safe to pass.
 
     Returns:
         Dict: Parsed JSON data from the cache file
     """
-    _ensure_cache_file_exists(cache_path, default_structure)
-
     try:
-        with open(cache_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            # Validate structure
-            if not isinstance(data, dict):
-                return default_structure
-            return data
+        with open(cache_path, 'rb') as file:
+            data = _loads(file.read())
+        # Validate structure
+        if not isinstance(data, dict):
+            return copy.deepcopy(default_structure)
+        return data
+    except FileNotFoundError:
+        _create_cache_file(cache_path, default_structure)
+        return copy.deepcopy(default_structure)
     except json.JSONDecodeError:
         # Corrupted JSON, return default
-        return default_structure
+        return copy.deepcopy(default_structure)
     except Exception:
-        return default_structure
+        return copy.deepcopy(default_structure)
 
 
 def _write_cache_file(cache_path: str, data: Dict) -> bool:
@@ -146,26 +241,32 @@ def _write_cache_file(cache_path: str, data: Dict) -> bool:
     Returns:
         bool: True if write successful, False otherwise
     """
+    try:
+        raw = _dumps(data)
+    except (TypeError, ValueError) as e:
+        print(f"Error writing cache file: {e}")
+        return False
+
     try:
         # Write to a temporary file first
         temp_path = cache_path + '.tmp'
-        with open(temp_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=4, ensure_ascii=False)
+        with open(temp_path, 'wb') as file:
+            file.write(raw)
+            # Make sure the data is on disk before the rename can land
+            file.flush()
+            os.fsync(file.fileno())
 
-        # If write successful, replace the original
-        if os.path.exists(cache_path):
-            os.remove(cache_path)
-        os.rename(temp_path, cache_path)
+        # Atomically replace the original (also works if it doesn't exist yet)
+        os.replace(temp_path, cache_path)
 
         return True
     except Exception as e:
         print(f"Error writing cache file: {e}")
         # Clean up temp file if it exists
-        if os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except:
-                pass
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
         return False
 
 
@@ -189,20 +290,90 @@ def get_accounts(provider: str) -> List[Dict]:
         'My Channel'
         'Gaming Channel'
     """
-    if provider not in ["twitter", "youtube"]:
-        raise ValueError(f"Invalid provider: {provider}. Must be 'twitter' or 'youtube'")
-
     # Determine cache path based on provider
-    cache_path = get_twitter_cache_path() if provider == "twitter" else get_youtube_cache_path()
+    cache_path = _get_account_cache_path(provider)
 
     # Read cache with default structure
-    default_structure = {"accounts": []}
-    data = _read_cache_file(cache_path, default_structure)
+    data = _read_cache_file(cache_path, _ACCOUNTS_DEFAULT)
 
     # Return accounts list
     return data.get('accounts', [])
 
 
+def _bulk_add(cache_path: str, default_structure: Dict, key: str,
+              items: List[Dict], label: str) -> int:
+    """
+    Appends items to a cache file list, skipping IDs that are already present.
+
+    The file is read once and written at most once, regardless of how many
+    items are added. This is an internal helper function.
+
+    Args:
+        cache_path (str): Path to the cache file
+        default_structure (Dict): Default structure if the file is missing or corrupt
+        key (str): Top-level key holding the list ("accounts" or "products")
+        items (List[Dict]): Validated items to add
+        label (str): Human-readable item name used in warnings
+
+    Returns:
+        int: Number of items added (0 if nothing was new or the write failed)
+    """
+    data = _read_cache_file(cache_path, default_structure)
+
+    stored = data.get(key, [])
+    existing_ids = {item.get('id') for item in stored}
+    added = 0
+
+    for item in items:
+        if item['id'] in existing_ids:
+            print(f"Warning: {label} with ID {item['id']} already exists. Skipping.")
+            continue
+        existing_ids.add(item['id'])
+        stored.append(item)
+        added += 1
+
+    if added == 0:
+        return 0
+
+    data[key] = stored
+
+    # Write back to cache
+    return added if _write_cache_file(cache_path, data) else 0
+
+
+def bulk_add_accounts(provider: str, accounts: Iterable[Dict]) -> int:
+    """
+    Adds several accounts to the cache with a single read and write.
+
+    Accounts whose ID already exists (in the cache or earlier in the batch)
+    are skipped with a warning.
+
+    Args:
+        provider (str): The provider ("twitter" or "youtube")
+        accounts (Iterable[Dict]): Account data dictionaries, each with an 'id'
+
+    Returns:
+        int: Number of accounts added (0 if nothing was new or the write failed)
+
+    Raises:
+        ValueError: If provider is invalid or any account data is malformed
+
+    Example:
+        >>> bulk_add_accounts("youtube", [{"id": "uuid-1"}, {"id": "uuid-2"}])
+        2
+    """
+    # Get cache path
+    cache_path = _get_account_cache_path(provider)
+
+    # Validate everything up front so a bad entry can't cause a partial import
+    accounts = list(accounts)
+    for account in accounts:
+        if not isinstance(account, dict) or 'id' not in account:
+            raise ValueError("Account must be a dictionary with at least an 'id' field")
+
+    return _bulk_add(cache_path, _ACCOUNTS_DEFAULT, 'accounts', accounts, "Account")
+
+
 def add_account(provider: str, account: Dict) -> bool:
     """
     Adds a new account to the cache for the specified provider.
@@ -226,33 +397,7 @@ def add_account(provider: str, account: Dict) -> bool:
         >>> add_account("twitter", account_data)
         True
     """
-    if provider not in ["twitter", "youtube"]:
-        raise ValueError(f"Invalid provider: {provider}")
-
-    # Validate account has required fields
-    if not isinstance(account, dict) or 'id' not in account:
-        raise ValueError("Account must be a dictionary with at least an 'id' field")
-
-    # Get cache path
-    cache_path = get_twitter_cache_path() if provider == "twitter" else get_youtube_cache_path()
-
-    # Read current accounts
-    default_structure = {"accounts": []}
-    data = _read_cache_file(cache_path, default_structure)
-
-    # Check if account with this ID already exists
-    accounts = data.get('accounts', [])
-    existing_ids = [acc.get('id') for acc in accounts]
-    if account['id'] in existing_ids:
-        print(f"Warning: Account with ID {account['id']} already exists. Skipping.")
-        return False
-
-    # Add new account
-    accounts.append(account)
-    data['accounts'] = accounts
-
-    # Write back to cache
-    return _write_cache_file(cache_path, data)
+    return bulk_add_accounts(provider, [account]) == 1
 
 
 def remove_account(provider: str, account_id: str) -> bool:
@@ -270,23 +415,19 @@ def remove_account(provider: str, account_id: str) -> bool:
         >>> remove_account("twitter", "uuid-123")
         True
     """
-    if provider not in ["twitter", "youtube"]:
-        raise ValueError(f"Invalid provider: {provider}")
-
     # Get cache path
-    cache_path = get_twitter_cache_path() if provider == "twitter" else get_youtube_cache_path()
+    cache_path = _get_account_cache_path(provider)
 
     # Read current accounts
-    default_structure = {"accounts": []}
-    data = _read_cache_file(cache_path, default_structure)
+    data = _read_cache_file(cache_path, _ACCOUNTS_DEFAULT)
 
     # Remove the account with matching ID
     accounts = data.get('accounts', [])
-    original_count = len(accounts)
-    accounts = [account for account in accounts if account.get('id') != account_id]
-
-    # Check if anything was removed
-    if len(accounts) == original_count:
+    for index, account in enumerate(accounts):
+        if account.get('id') == account_id:
+            del accounts[index]
+            break
+    else:
         print(f"Warning: No account found with ID {account_id}")
         return False
 
@@ -312,15 +453,11 @@ def update_account(provider: str, account_id: str, updates: Dict) -> bool:
         >>> update_account("youtube", "uuid-123", {"nickname": "New Name"})
         True
     """
-    if provider not in ["twitter", "youtube"]:
-        raise ValueError(f"Invalid provider: {provider}")
-
     # Get cache path
-    cache_path = get_twitter_cache_path() if provider == "twitter" else get_youtube_cache_path()
+    cache_path = _get_account_cache_path(provider)
 
     # Read current accounts
-    default_structure = {"accounts": []}
-    data = _read_cache_file(cache_path, default_structure)
+    data = _read_cache_file(cache_path, _ACCOUNTS_DEFAULT)
 
     # Find and update the account
     accounts = data.get('accounts', [])
@@ -355,11 +492,38 @@ def get_products() -> List[Dict]:
         ...     print(product["affiliate_link"])
     """
     cache_path = get_afm_cache_path()
-    default_structure = {"products": []}
-    data = _read_cache_file(cache_path, default_structure)
+    data = _read_cache_file(cache_path, _PRODUCTS_DEFAULT)
     return data.get("products", [])
 
 
+def bulk_add_products(products: Iterable[Dict]) -> int:
+    """
+    Adds several affiliate products to the cache with a single read and write.
+
+    Products whose ID already exists (in the cache or earlier in the batch)
+    are skipped with a warning.
+
+    Args:
+        products (Iterable[Dict]): Product data dictionaries, each with an 'id'
+
+    Returns:
+        int: Number of products added (0 if nothing was new or the write failed)
+
+    Raises:
+        ValueError: If any product data is malformed
+
+    Example:
+        >>> bulk_add_products([{"id": "uuid-1"}, {"id": "uuid-2"}])
+        2
+    """
+    products = list(products)
+    for product in products:
+        if not isinstance(product, dict) or 'id' not in product:
+            raise ValueError("Product must be a dictionary with at least an 'id' field")
+
+    return _bulk_add(get_afm_cache_path(), _PRODUCTS_DEFAULT, 'products', products, "Product")
+
+
 def add_product(product: Dict) -> bool:
     """
     Adds a new affiliate product to the cache.
@@ -379,27 +543,10 @@ def add_product(product: Dict) -> bool:
         >>> add_product(product_data)
         True
     """
-    if not isinstance(product, dict) or 'id' not in product:
-        raise ValueError("Product must be a dictionary with at least an 'id' field")
-
-    cache_path = get_afm_cache_path()
-    default_structure = {"products": []}
-    data = _read_cache_file(cache_path, default_structure)
-
-    # Check for duplicate
-    products = data.get('products', [])
-    existing_ids = [p.get('id') for p in products]
-    if product['id'] in existing_ids:
-        print(f"Warning: Product with ID {product['id']} already exists. Skipping.")
-        return False
-
-    # Add product
-    products.append(product)
-    data['products'] = products
-
-    return _write_cache_file(cache_path, data)
+    return bulk_add_products([product]) == 1
 
 
+@functools.lru_cache(maxsize=None)
 def get_results_cache_path() -> str:
     """
     Gets the path to the Google Maps scraper results cache file.
@@ -431,22 +578,74 @@ def clear_cache(provider: Optional[str] = None) -> bool:
         True
     """
     try:
+        cache_paths = []
         if provider == "twitter" or provider is None:
-            cache_path = get_twitter_cache_path()
-            if os.path.exists(cache_path):
-                os.remove(cache_path)
+            cache_paths.append(get_twitter_cache_path())
 
         if provider == "youtube" or provider is None:
-            cache_path = get_youtube_cache_path()
-            if os.path.exists(cache_path):
-                os.remove(cache_path)
+            cache_paths.append(get_youtube_cache_path())
 
         if provider == "afm" or provider is None:
-            cache_path = get_afm_cache_path()
-            if os.path.exists(cache_path):
+            cache_paths.append(get_afm_cache_path())
+
+        for cache_path in cache_paths:
+            try:
                 os.remove(cache_path)
+            except FileNotFoundError:
+                pass
 
         return True
     except Exception as e:
         print(f"Error clearing cache: {e}")
         return False
+
+
+def snapshot_cache() -> Dict[str, Dict]:
+    """
+    Captures the current contents of all account and product cache files.
+
+    Missing files are created with their default structure first, so the
+    snapshot always covers every cache file.
+
+    Returns:
+        Dict[str, Dict]: Parsed contents keyed by cache file path
+
+    Example:
+        >>> snapshot = snapshot_cache()
+        >>> add_account("twitter", {"id": "temp"})
+        True
+        >>> restore_cache(snapshot)  # "temp" is gone again
+    """
+    return {
+        get_twitter_cache_path(): _read_cache_file(get_twitter_cache_path(), _ACCOUNTS_DEFAULT),
+        get_youtube_cache_path(): _read_cache_file(get_youtube_cache_path(), _ACCOUNTS_DEFAULT),
+        get_afm_cache_path(): _read_cache_file(get_afm_cache_path(), _PRODUCTS_DEFAULT),
+    }
+
+
+def restore_cache(snapshot: Dict[str, Dict]) -> bool:
+    """
+    Rolls the cache files back to a snapshot taken with snapshot_cache().
+
+    Only files that changed since are rewritten: a file whose contents
+    already match the snapshot is left alone.
+
+    Args:
+        snapshot (Dict[str, Dict]): Result of an earlier snapshot_cache() call
+
+    Returns:
+        bool: True if every file matches the snapshot afterwards
+    """
+    restored = True
+    for cache_path, data in snapshot.items():
+        try:
+            with open(cache_path, 'rb') as file:
+                if file.read() == _dumps(data):
+                    continue
+        except OSError:
+            # Missing or unreadable, rewrite it
+            pass
+
+        restored = _write_cache_file(cache_path, data) and restored
+
+    return restored
@@ -9,14 +9,299 @@ License: AGPL-3.0
 """
 
 import os
+import re
 import sys
+import time
+import signal
 import platform
+import functools
 import subprocess
-import shutil
-from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple
 from termcolor import colored
 
 
+# The OS can't change while we're running, so resolve it once at import
+_SYSTEM = platform.system()
+_IS_WINDOWS = _SYSTEM == "Windows"
+_IS_LINUX = _SYSTEM == "Linux"
+_IS_MACOS = _SYSTEM == "Darwin"
+
+# Nor can the interpreter, so the Python version check is a constant too
+_PY_VERSION_STR = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
+_PY_VALID = sys.version_info.major == 3 and sys.version_info.minor >= 9
+
+# How long (seconds) a dependency report is reused before re-checking,
+# and the (timestamp, report) pair it was last built at
+_REPORT_TTL = 5.0
+_report_cache: Optional[Tuple[float, Dict[str, Dict]]] = None
+
+
+# KEY=value or KEY="value" lines in /etc/os-release, ignoring surrounding
+# whitespace (including a stray \r) the way a per-line strip() would
+_OS_RELEASE_RE = re.compile(r'^[ \t]*([A-Z0-9_]+)=(["\']?)(.*?)\2[ \t\r]*$', re.M)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_distro_info() -> Dict[str, str]:
+    """
+    Parse the Linux distribution information behind PlatformDetector.get_distro_info.
+
+    Returns:
+        Dict[str, str]: Dictionary containing distribution information
+    """
+    if not _IS_LINUX:
+        return {}
+
+    try:
+        # Try to read /etc/os-release (works on most modern Linux distros).
+        # It's ~1 KB, so read it in one go and let the regex do the splitting.
+        with open("/etc/os-release", "r") as f:
+            content = f.read()
+        return {match.group(1): match.group(3) for match in _OS_RELEASE_RE.finditer(content)}
+    except Exception:
+        pass
+
+    return {"NAME": "Unknown Linux"}
+
+
+@functools.lru_cache(maxsize=None)
+def _path_dirs() -> tuple:
+    """
+    Split PATH into its directories once.
+
+    Returns:
+        tuple: Non-empty PATH entries in search order
+    """
+    return tuple(d for d in os.environ.get("PATH", os.defpath).split(os.pathsep) if d)
+
+
+@functools.lru_cache(maxsize=None)
+def _path_extensions() -> tuple:
+    """
+    Get the executable extensions to try (PATHEXT on Windows).
+
+    Returns:
+        tuple: Lower-case extensions on Windows, or ("",) elsewhere
+    """
+    if not _IS_WINDOWS:
+        return ("",)
+    pathext = os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD")
+    return tuple(ext.lower() for ext in pathext.split(os.pathsep) if ext)
+
+
+def _is_executable(path: str) -> bool:
+    """
+    Check whether path is a file we could execute.
+
+    Args:
+        path (str): Candidate path
+
+    Returns:
+        bool: True if the file exists and is executable
+    """
+    return os.path.isfile(path) and (_IS_WINDOWS or os.access(path, os.X_OK))
+
+
+@functools.lru_cache(maxsize=None)
+def _which_fast(command: str) -> Optional[str]:
+    """
+    Memoized, PATHEXT-aware replacement for shutil.which.
+
+    PATH and PATHEXT are split once and reused for every lookup. On Windows
+    a command that already carries a PATHEXT extension (e.g. "magick.exe")
+    is tried as-is; otherwise every extension is appended in turn.
+
+    Args:
+        command (str): Name of the command to look up
+
+    Returns:
+        Optional[str]: Full path to the command, or None if not found
+    """
+    extensions = _path_extensions()
+    if _IS_WINDOWS and command.lower().endswith(extensions):
+        names = (command,)
+    else:
+        names = tuple(command + ext for ext in extensions)
+
+    # Commands given with a directory component are not searched on PATH
+    if os.path.dirname(command):
+        return next((name for name in names if _is_executable(name)), None)
+
+    for directory in _path_dirs():
+        for name in names:
+            candidate = os.path.join(directory, name)
+            if _is_executable(candidate):
+                return candidate
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _go_version(go_path: str) -> Optional[str]:
+    """
+    Run `go version` for a given Go binary, memoized per binary path.
+
+    Args:
+        go_path (str): Full path to the go binary
+
+    Returns:
+        Optional[str]: Output of `go version`, or None if it failed
+    """
+    try:
+        result = subprocess.run(
+            [go_path, "version"],
+            capture_output=True,
+            text=True,
+            check=False
+        )
+    except OSError:
+        return None
+    if result.returncode == 0:
+        return result.stdout.strip()
+    return None
+
+
+def _find_pids_by_name(process_name: str) -> List[int]:
+    """
+    Find running processes whose name contains process_name by reading /proc.
+
+    Matches against /proc/<pid>/comm the same way `pkill` does, without
+    spawning it. Only usable on Linux.
+
+    Args:
+        process_name (str): Name (or part of the name) of the process
+
+    Returns:
+        List[int]: PIDs of matching processes, excluding our own
+    """
+    # An empty pattern would match every process on the system
+    if not process_name:
+        return []
+
+    own_pid = os.getpid()
+    pids = []
+    with os.scandir("/proc") as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            pid = int(entry.name)
+            if pid == own_pid:
+                continue
+            try:
+                with open(f"/proc/{pid}/comm", "r") as f:
+                    comm = f.read().strip()
+            except OSError:
+                # Process exited while we were scanning
+                continue
+            if process_name in comm:
+                pids.append(pid)
+    return pids
+
+
+def _kill_pid(pid: int) -> bool:
+    """
+    Send SIGKILL to a single process.
+
+    Args:
+        pid (int): Process ID to kill
+
+    Returns:
+        bool: True if the signal was delivered, False otherwise
+    """
+    try:
+        os.kill(pid, signal.SIGKILL)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+def _kill_processes_by_name(process_name: str) -> None:
+    """
+    Kill every process matching process_name using the cheapest available method.
+
+    On Linux the PIDs are collected from /proc and signalled from a thread
+    pool, avoiding a pkill fork+exec. Elsewhere this falls back to
+    taskkill (Windows) or pkill (macOS).
+
+    Args:
+        process_name (str): Platform-appropriate process name
+
+    Returns:
+        None
+    """
+    if _IS_WINDOWS:
+        subprocess.run(
+            ["taskkill", "/F", "/IM", process_name],
+            capture_output=True,
+            check=False
+        )
+    elif os.path.isdir("/proc"):
+        pids = _find_pids_by_name(process_name)
+        if pids:
+            with ThreadPoolExecutor(max_workers=min(8, len(pids))) as executor:
+                list(executor.map(_kill_pid, pids))
+    else:
+        subprocess.run(
+            ["pkill", "-9", process_name],
+            capture_output=True,
+            check=False
+        )
+
+
+@functools.lru_cache(maxsize=1024)
+def _normpath_cached(path: str) -> str:
+    """
+    Normalize a path that has nothing to expand, memoized per path.
+
+    Args:
+        path (str): Path without "~", "$" or "%"
+
+    Returns:
+        str: Normalized (but not necessarily absolute) path
+    """
+    return os.path.normpath(path)
+
+
+def _expand_path(path: str) -> str:
+    """
+    Expand ~ and environment variables in a path and normalize it.
+
+    Only paths without "~", "$" or "%" are served from a cache: anything
+    that expands depends on the environment at the time of the call.
+
+    Args:
+        path (str): Path to expand
+
+    Returns:
+        str: Expanded, normalized (but not necessarily absolute) path
+    """
+    if "~" not in path and "$" not in path and "%" not in path:
+        return _normpath_cached(path)
+
+    path = os.path.expanduser(path)
+    path = os.path.expandvars(path)
+    return os.path.normpath(path)
+
+
+def clear_dependency_cache() -> None:
+    """
+    Forget memoized dependency lookups.
+
+    Call this after installing a dependency or changing PATH so the next
+    check resolves everything again.
+
+    Returns:
+        None
+    """
+    _path_dirs.cache_clear()
+    _path_extensions.cache_clear()
+    _which_fast.cache_clear()
+    _go_version.cache_clear()
+
+    global _report_cache
+    _report_cache = None
+
+
 class PlatformDetector:
     """
     Detects and provides information about the current operating system platform.
@@ -33,7 +318,7 @@ class PlatformDetector:
         Returns:
             bool: True if running on Windows, False otherwise
         """
-        return platform.system() == "Windows"
+        return _IS_WINDOWS
 
     @staticmethod
     def is_linux() -> bool:
@@ -43,7 +328,7 @@ class PlatformDetector:
         Returns:
             bool: True if running on Linux, False otherwise
         """
-        return platform.system() == "Linux"
+        return _IS_LINUX
 
     @staticmethod
     def is_macos() -> bool:
@@ -53,7 +338,7 @@ class PlatformDetector:
         Returns:
             bool: True if running on macOS, False otherwise
         """
-        return platform.system() == "Darwin"
+        return _IS_MACOS
 
     @staticmethod
     def get_os_name() -> str:
@@ -63,10 +348,9 @@ class PlatformDetector:
         Returns:
             str: Name of the operating system (e.g., "Windows", "Linux", "macOS")
         """
-        system = platform.system()
-        if system == "Darwin":
+        if _IS_MACOS:
             return "macOS"
-        return system
+        return _SYSTEM
 
     @staticmethod
     def get_distro_info() -> Dict[str, str]:
@@ -77,23 +361,8 @@ class PlatformDetector:
             Dict[str, str]: Dictionary containing distribution information
                            Returns empty dict if not on Linux
         """
-        if not PlatformDetector.is_linux():
-            return {}
-
-        try:
-            # Try to read /etc/os-release (works on most modern Linux distros)
-            if os.path.exists("/etc/os-release"):
-                info = {}
-                with open("/etc/os-release", "r") as f:
-                    for line in f:
-                        if "=" in line:
-                            key, value = line.strip().split("=", 1)
-                            info[key] = value.strip('"')
-                return info
-        except Exception:
-            pass
-
-        return {"NAME": "Unknown Linux"}
+        # /etc/os-release is only parsed once; hand out copies of the result
+        return dict(_load_distro_info())
 
 
 class ProcessManager:
@@ -116,20 +385,7 @@ class ProcessManager:
             bool: True if successfully killed processes, False otherwise
         """
         try:
-            if PlatformDetector.is_windows():
-                # Windows: Use taskkill
-                subprocess.run(
-                    ["taskkill", "/F", "/IM", "firefox.exe"],
-                    capture_output=True,
-                    check=False
-                )
-            else:
-                # Linux/macOS: Use pkill
-                subprocess.run(
-                    ["pkill", "-9", "firefox"],
-                    capture_output=True,
-                    check=False
-                )
+            _kill_processes_by_name("firefox.exe" if _IS_WINDOWS else "firefox")
             return True
         except Exception as e:
             print(colored(f"Warning: Could not kill Firefox instances: {e}", "yellow"))
@@ -151,25 +407,46 @@ class ProcessManager:
                 # Add .exe extension if not present
                 if not process_name.endswith(".exe"):
                     process_name += ".exe"
-                subprocess.run(
-                    ["taskkill", "/F", "/IM", process_name],
-                    capture_output=True,
-                    check=False
-                )
             else:
                 # Remove .exe extension if present
                 process_name = process_name.replace(".exe", "")
-                subprocess.run(
-                    ["pkill", "-9", process_name],
-                    capture_output=True,
-                    check=False
-                )
+            _kill_processes_by_name(process_name)
             return True
         except Exception as e:
             print(colored(f"Warning: Could not kill process {process_name}: {e}", "yellow"))
             return False
 
 
+@functools.lru_cache(maxsize=None)
+def _report_strings() -> Dict[str, object]:
+    """
+    Build the fixed, coloured pieces of the dependency report.
+
+    termcolor decides whether to colour (isatty, NO_COLOR, FORCE_COLOR)
+    when colored() is called, so these are built on the first report
+    rather than at import, when stdout may not be set up yet.
+
+    Returns:
+        Dict[str, object]: Coloured strings (or lists of lines) by name
+    """
+    return {
+        "bar": colored("="*60, "cyan"),
+        "header": [
+            colored("\n" + "="*60, "cyan"),
+            colored("        SYSTEM DEPENDENCY CHECK", "cyan", attrs=["bold"]),
+            colored("="*60 + "\n", "cyan"),
+        ],
+        "footer": colored("="*60 + "\n", "cyan"),
+        "critical": colored(" [CRITICAL]", "yellow"),
+        "optional": colored(" [OPTIONAL]", "blue"),
+        "all_met": colored("✓ All critical dependencies are satisfied!", "green", attrs=["bold"]),
+        "missing": [
+            colored("✗ Some critical dependencies are missing!", "red", attrs=["bold"]),
+            colored("\nPlease install missing dependencies before continuing.", "yellow"),
+        ],
+    }
+
+
 class DependencyChecker:
     """
     Checks for required system dependencies and provides installation guidance.
@@ -189,7 +466,7 @@ class DependencyChecker:
         Returns:
             bool: True if command exists, False otherwise
         """
-        return shutil.which(command) is not None
+        return _which_fast(command) is not None
 
     @staticmethod
     def check_python_version() -> tuple[bool, str]:
@@ -199,10 +476,7 @@ class DependencyChecker:
         Returns:
             tuple[bool, str]: (is_valid, version_string)
         """
-        version = sys.version_info
-        version_str = f"{version.major}.{version.minor}.{version.micro}"
-        is_valid = version.major == 3 and version.minor >= 9
-        return is_valid, version_str
+        return _PY_VALID, _PY_VERSION_STR
 
     @staticmethod
     def check_imagemagick() -> tuple[bool, Optional[str]]:
@@ -214,11 +488,11 @@ class DependencyChecker:
         """
         if PlatformDetector.is_windows():
             # On Windows, look for magick.exe
-            magick_path = shutil.which("magick")
+            magick_path = _which_fast("magick")
             return (magick_path is not None, magick_path)
         else:
             # On Linux/macOS, look for convert
-            convert_path = shutil.which("convert")
+            convert_path = _which_fast("convert")
             return (convert_path is not None, convert_path)
 
     @staticmethod
@@ -230,7 +504,7 @@ class DependencyChecker:
             tuple[bool, Optional[str]]: (is_installed, path_to_binary)
         """
         if PlatformDetector.is_windows():
-            firefox_path = shutil.which("firefox")
+            firefox_path = _which_fast("firefox")
             if not firefox_path:
                 # Try common installation paths
                 common_paths = [
@@ -242,7 +516,7 @@ class DependencyChecker:
                         return (True, path)
             return (firefox_path is not None, firefox_path)
         else:
-            firefox_path = shutil.which("firefox")
+            firefox_path = _which_fast("firefox")
             return (firefox_path is not None, firefox_path)
 
     @staticmethod
@@ -253,31 +527,45 @@ class DependencyChecker:
         Returns:
             tuple[bool, Optional[str]]: (is_installed, version_string)
         """
-        try:
-            result = subprocess.run(
-                ["go", "version"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            if result.returncode == 0:
-                return (True, result.stdout.strip())
+        go_path = _which_fast("go")
+        if go_path is None:
             return (False, None)
-        except FileNotFoundError:
+
+        version = _go_version(go_path)
+        if version is None:
             return (False, None)
+        return (True, version)
 
     @staticmethod
     def get_dependency_report() -> Dict[str, Dict[str, any]]:
         """
         Generate a comprehensive report of all system dependencies.
 
+        Reports are reused for a few seconds, so repeated checks during
+        startup don't redo the work; clear_dependency_cache() forces a
+        fresh one.
+
         Returns:
             Dict[str, Dict[str, any]]: Report containing status of all dependencies
         """
+        global _report_cache
+
+        now = time.monotonic()
+        if _report_cache is not None and now - _report_cache[0] < _REPORT_TTL:
+            return {name: dict(info) for name, info in _report_cache[1].items()}
+
         report = {}
 
+        # The checks are independent (PATH scans and reading the Go binary),
+        # so run them concurrently; first-call latency becomes the slowest one
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            py_future = executor.submit(DependencyChecker.check_python_version)
+            im_future = executor.submit(DependencyChecker.check_imagemagick)
+            ff_future = executor.submit(DependencyChecker.check_firefox)
+            go_future = executor.submit(DependencyChecker.check_go)
+
         # Python version
-        py_valid, py_version = DependencyChecker.check_python_version()
+        py_valid, py_version = py_future.result()
         report["python"] = {
             "installed": True,
             "valid": py_valid,
@@ -287,7 +575,7 @@ class DependencyChecker:
         }
 
         # ImageMagick
-        im_installed, im_path = DependencyChecker.check_imagemagick()
+        im_installed, im_path = im_future.result()
         report["imagemagick"] = {
             "installed": im_installed,
             "path": im_path,
@@ -296,7 +584,7 @@ class DependencyChecker:
         }
 
         # Firefox
-        ff_installed, ff_path = DependencyChecker.check_firefox()
+        ff_installed, ff_path = ff_future.result()
         report["firefox"] = {
             "installed": ff_installed,
             "path": ff_path,
@@ -305,7 +593,7 @@ class DependencyChecker:
         }
 
         # Go
-        go_installed, go_version = DependencyChecker.check_go()
+        go_installed, go_version = go_future.result()
         report["go"] = {
             "installed": go_installed,
             "version": go_version,
@@ -313,6 +601,7 @@ class DependencyChecker:
             "critical": False
         }
 
+        _report_cache = (now, {name: dict(info) for name, info in report.items()})
         return report
 
     @staticmethod
@@ -323,9 +612,9 @@ class DependencyChecker:
         Returns:
             bool: True if all critical dependencies are met, False otherwise
         """
-        print(colored("\n" + "="*60, "cyan"))
-        print(colored("        SYSTEM DEPENDENCY CHECK", "cyan", attrs=["bold"]))
-        print(colored("="*60 + "\n", "cyan"))
+        # Collect the whole report and write it once instead of a print per line
+        strings = _report_strings()
+        lines = list(strings["header"])
 
         report = DependencyChecker.get_dependency_report()
         all_critical_met = True
@@ -341,19 +630,21 @@ class DependencyChecker:
                     status_color = "red"
 
             is_critical = info.get("critical", False)
-            critical_text = " [CRITICAL]" if is_critical else " [OPTIONAL]"
+            critical_text = strings["critical"] if is_critical else strings["optional"]
 
-            print(colored(f"{status_icon} {name.upper()}", status_color, attrs=["bold"]), end="")
-            print(colored(critical_text, "yellow" if is_critical else "blue"))
+            lines.append(
+                colored(f"{status_icon} {name.upper()}", status_color, attrs=["bold"])
+                + critical_text
+            )
 
             if "version" in info and info["version"]:
-                print(f"   Version: {info['version']}")
+                lines.append(f"   Version: {info['version']}")
             if "path" in info and info["path"]:
-                print(f"   Path: {info['path']}")
+                lines.append(f"   Path: {info['path']}")
             if "required_for" in info:
-                print(f"   Required for: {info['required_for']}")
+                lines.append(f"   Required for: {info['required_for']}")
             if "required" in info:
-                print(f"   Minimum required: {info['required']}")
+                lines.append(f"   Minimum required: {info['required']}")
 
             # Track critical dependencies
             if is_critical and not info["installed"]:
@@ -361,17 +652,19 @@ class DependencyChecker:
             if "valid" in info and not info["valid"]:
                 all_critical_met = False
 
-            print()  # Blank line between entries
+            lines.append("")  # Blank line between entries
 
-        print(colored("="*60, "cyan"))
+        lines.append(strings["bar"])
 
         if all_critical_met:
-            print(colored("✓ All critical dependencies are satisfied!", "green", attrs=["bold"]))
+            lines.append(strings["all_met"])
         else:
-            print(colored("✗ Some critical dependencies are missing!", "red", attrs=["bold"]))
-            print(colored("\nPlease install missing dependencies before continuing.", "yellow"))
+            lines.extend(strings["missing"])
+
+        lines.append(strings["footer"])
 
-        print(colored("="*60 + "\n", "cyan"))
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
         return all_critical_met
 
@@ -410,8 +703,6 @@ class PathResolver:
         Returns:
             str: Normalized path
         """
-        # Convert to absolute path and normalize separators
-        path = os.path.expanduser(path)
-        path = os.path.expandvars(path)
-        path = os.path.normpath(path)
-        return os.path.abspath(path)
+        # Plain paths are memoized; abspath depends on the working directory
+        # so it is applied on every call
+        return os.path.abspath(_expand_path(path))
@@ -10,10 +10,14 @@ Author: MoneyPrinter V2 Team
 License: AGPL-3.0
 """
 
+import io
 import os
+import stat
 import random
 import zipfile
+import tempfile
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from status import *
@@ -21,6 +25,23 @@ from config import *
 from platform_utils import ProcessManager, PlatformDetector
 
 
+# Upper bound on threads used to delete temporary files
+_UNLINK_WORKERS = 8
+
+# Chunk size used when streaming downloads
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Downloads up to this size are held in memory; larger (or unknown-size)
+# ones go to an anonymous temporary file
+_SPOOL_MAX_SIZE = 64 << 20
+
+# Files that count as already-downloaded songs in fetch_songs()
+_FETCHED_SONG_EXTS = ('.mp3', '.wav')
+
+# Files choose_random_song() may pick as background music
+_AUDIO_EXTS = ('.mp3', '.wav', '.ogg', '.m4a')
+
+
 def close_running_selenium_instances() -> bool:
     """
     Closes any running Selenium/Firefox instances to prevent conflicts.
@@ -97,27 +118,40 @@ def rem_temp_files() -> int:
                 warning(f" => Temp directory {mp_dir} does not exist yet.")
             return 0
 
-        files = os.listdir(mp_dir)
-        removed_count = 0
+        # scandir gives us the file type from the directory listing itself,
+        # so we don't need a separate stat per entry
+        with os.scandir(mp_dir) as entries:
+            # Skip JSON files (they contain cache data) and directories
+            temp_files = [
+                entry for entry in entries
+                if not entry.name.endswith(".json") and entry.is_file()
+            ]
 
-        for file in files:
-            # Skip JSON files (they contain cache data)
-            if not file.endswith(".json"):
-                file_path = os.path.join(mp_dir, file)
+        if not temp_files:
+            return 0
 
-                # Only remove files, not directories
-                if os.path.isfile(file_path):
-                    try:
-                        os.remove(file_path)
-                        removed_count += 1
-                        if get_verbose():
-                            info(f" => Removed temp file: {file}")
-                    except Exception as e:
-                        if get_verbose():
-                            warning(f" => Could not remove {file}: {e}")
+        # Unlinks are independent syscalls, so overlap them; failures are
+        # collected from the futures afterwards instead of per call
+        workers = min(_UNLINK_WORKERS, len(temp_files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(os.remove, entry.path) for entry in temp_files]
 
-        if get_verbose() and removed_count > 0:
-            success(f" => Removed {removed_count} temporary files.")
+        failed = {
+            entry.name: future.exception()
+            for entry, future in zip(temp_files, futures)
+            if future.exception() is not None
+        }
+        removed_count = len(temp_files) - len(failed)
+
+        if get_verbose():
+            for entry in temp_files:
+                if entry.name in failed:
+                    warning(f" => Could not remove {entry.name}: {failed[entry.name]}")
+                else:
+                    info(f" => Removed temp file: {entry.name}")
+
+            if removed_count > 0:
+                success(f" => Removed {removed_count} temporary files.")
 
         return removed_count
 
@@ -134,7 +168,9 @@ def fetch_songs() -> bool:
     1. Creates the Songs directory if it doesn't exist
     2. Downloads a ZIP file containing royalty-free music
     3. Extracts the ZIP contents
-    4. Cleans up the ZIP file
+
+    The archive is held in memory (or an anonymous temporary file if it is
+    large), so it never has to be written next to the songs and deleted.
 
     If songs are already downloaded, this function skips the download.
 
@@ -151,13 +187,17 @@ def fetch_songs() -> bool:
         files_dir = os.path.join(ROOT_DIR, "Songs")
 
         # Create Songs directory if it doesn't exist
-        if not os.path.exists(files_dir):
+        try:
             os.makedirs(files_dir)
             if get_verbose():
                 info(f" => Created directory: {files_dir}")
-        else:
+        except FileExistsError:
             # Check if songs already exist
-            existing_files = [f for f in os.listdir(files_dir) if f.endswith(('.mp3', '.wav'))]
+            with os.scandir(files_dir) as entries:
+                existing_files = [
+                    entry.name for entry in entries
+                    if entry.name.endswith(_FETCHED_SONG_EXTS) and entry.is_file()
+                ]
             if len(existing_files) > 0:
                 if get_verbose():
                     success(f" => Songs already exist ({len(existing_files)} files). Skipping download.")
@@ -171,35 +211,46 @@ def fetch_songs() -> bool:
         if get_verbose():
             info(f" => Downloading songs from: {zip_url}")
 
-        # Download songs with timeout
+        # Download songs with timeout, streaming the body instead of buffering it
         try:
-            response = requests.get(zip_url, timeout=60)
+            response = requests.get(zip_url, stream=True, timeout=60)
             response.raise_for_status()  # Raise exception for bad status codes
         except requests.exceptions.RequestException as e:
             error(f"Failed to download songs: {e}")
             return False
 
-        # Save the zip file
-        zip_path = os.path.join(files_dir, "songs.zip")
-        with open(zip_path, "wb") as file:
-            file.write(response.content)
+        # Keep the archive in memory when it's small and extract from there
+        content_length = int(response.headers.get("Content-Length") or 0)
+        if 0 < content_length <= _SPOOL_MAX_SIZE:
+            archive = io.BytesIO()
+        else:
+            archive = tempfile.TemporaryFile()
 
-        if get_verbose():
-            info(f" => Downloaded {len(response.content)} bytes")
+        with archive:
+            downloaded = 0
+            with response:
+                for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+                    archive.write(chunk)
+                    downloaded += len(chunk)
 
-        # Unzip the file
-        try:
-            with zipfile.ZipFile(zip_path, "r") as zip_file:
-                zip_file.extractall(files_dir)
             if get_verbose():
-                info(f" => Extracted songs to {files_dir}")
-        except zipfile.BadZipFile:
-            error("Downloaded file is not a valid ZIP archive")
-            os.remove(zip_path)
-            return False
-
-        # Remove the zip file
-        os.remove(zip_path)
+                info(f" => Downloaded {downloaded} bytes")
+
+            # Verify every member's CRC before writing anything, so a corrupt
+            # archive doesn't leave half the songs behind
+            try:
+                archive.seek(0)
+                with zipfile.ZipFile(archive, "r") as zip_file:
+                    bad_member = zip_file.testzip()
+                    if bad_member is not None:
+                        error(f"Downloaded archive is corrupted (bad member: {bad_member})")
+                        return False
+                    zip_file.extractall(files_dir)
+                if get_verbose():
+                    info(f" => Extracted songs to {files_dir}")
+            except zipfile.BadZipFile:
+                error("Downloaded file is not a valid ZIP archive")
+                return False
 
         success(" => Downloaded Songs to ../Songs.")
         return True
@@ -233,23 +284,26 @@ def choose_random_song() -> Optional[str]:
             error("Please run fetch_songs() first.")
             return None
 
-        # Get list of audio files
-        all_files = os.listdir(songs_dir)
-        songs = [f for f in all_files if f.endswith(('.mp3', '.wav', '.ogg', '.m4a'))]
-
-        if len(songs) == 0:
+        # Pick uniformly in a single directory pass without building a list:
+        # the k-th audio file replaces the current pick with probability 1/k
+        chosen = None
+        seen = 0
+        with os.scandir(songs_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(_AUDIO_EXTS) and entry.is_file():
+                    seen += 1
+                    if random.randrange(seen) == 0:
+                        chosen = entry
+
+        if chosen is None:
             error("No songs found in Songs directory")
             error("Please run fetch_songs() to download background music.")
             return None
 
-        # Choose random song
-        song = random.choice(songs)
-        song_path = os.path.join(songs_dir, song)
-
         if get_verbose():
-            success(f" => Chose song: {song}")
+            success(f" => Chose song: {chosen.name}")
 
-        return song_path
+        return chosen.path
 
     except Exception as e:
         error(f"Error occurred while choosing random song: {str(e)}")
@@ -271,11 +325,14 @@ def validate_file_exists(file_path: str, description: str = "File") -> bool:
         >>> validate_file_exists("/path/to/config.json", "Configuration file")
         True
     """
-    if not os.path.exists(file_path):
+    try:
+        st = os.stat(file_path)
+    except (OSError, ValueError):
+        # ValueError: the path has an embedded NUL byte
         error(f"{description} not found: {file_path}")
         return False
 
-    if not os.path.isfile(file_path):
+    if not stat.S_ISREG(st.st_mode):
         error(f"{description} is not a file: {file_path}")
         return False
 
@@ -297,10 +354,11 @@ def ensure_directory_exists(directory_path: str) -> bool:
         True
     """
     try:
-        if not os.path.exists(directory_path):
-            os.makedirs(directory_path)
-            if get_verbose():
-                success(f" => Created directory: {directory_path}")
+        os.makedirs(directory_path)
+        if get_verbose():
+            success(f" => Created directory: {directory_path}")
+        return True
+    except FileExistsError:
         return True
     except Exception as e:
         error(f"Failed to create directory {directory_path}: {e}")
@@ -0,0 +1,126 @@
+"""
+Shared Helpers for MoneyPrinter V2 Tests
+
+Utilities used by several test modules. Importing this module also puts
+src/ on sys.path, so test modules can import the application code.
+
+Author: MoneyPrinter V2 Team
+License: AGPL-3.0
+"""
+
+import os
+import sys
+import atexit
+import shutil
+import unittest
+import functools
+import tempfile
+
+
+# Put src/ on the import path once for every test module that imports us
+_SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+# Linux exposes a RAM-backed tmpfs at /dev/shm; cache and temp-file tests
+# create, rewrite and delete lots of small files, so keep them off the disk
+_MEMORY_DIR = "/dev/shm"
+
+# pytest-xdist worker name ("gw0", "gw1", ...), or "main" outside of xdist
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+# Directories created by make_test_dir() in this process
+_created_dirs = []
+
+
+def _memory_temp_root():
+    """
+    Get a RAM-backed directory to create test directories in, if there is one.
+
+    Returns:
+        str or None: /dev/shm if it is usable, otherwise None (the default temp dir)
+    """
+    if os.path.isdir(_MEMORY_DIR) and os.access(_MEMORY_DIR, os.W_OK | os.X_OK):
+        return _MEMORY_DIR
+    return None
+
+
+def make_test_dir(prefix="mp_test_"):
+    """
+    Create a temporary directory for a test, in memory when the platform allows.
+
+    The name includes the xdist worker, and the directory is removed by
+    remove_test_dirs() (at the latest when the interpreter exits), so
+    nothing is left behind in RAM.
+
+    Args:
+        prefix (str): Prefix for the directory name
+
+    Returns:
+        str: Path to the new, empty directory
+    """
+    path = tempfile.mkdtemp(prefix=f"{prefix}{WORKER_ID}_", dir=_memory_temp_root())
+    _created_dirs.append(path)
+    return path
+
+
+def fast_rmtree(path):
+    """
+    Remove a small, mostly flat test directory and everything in it.
+
+    Files are unlinked straight from the scandir listing without the extra
+    stat calls shutil.rmtree makes; only sub-directories fall back to it.
+    A missing directory is ignored.
+
+    Args:
+        path (str): Directory to remove
+
+    Returns:
+        None
+    """
+    try:
+        with os.scandir(path) as entries:
+            entries = list(entries)
+    except FileNotFoundError:
+        return
+
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+    os.rmdir(path)
+
+
+@atexit.register
+def remove_test_dirs():
+    """
+    Remove every directory created by make_test_dir() in this process.
+
+    Returns:
+        None
+    """
+    while _created_dirs:
+        shutil.rmtree(_created_dirs.pop(), ignore_errors=True)
+
+
+class _ReusableSuite(unittest.TestSuite):
+    """A TestSuite that keeps its tests after running, so it can be run again"""
+
+    _cleanup = False
+
+
+@functools.lru_cache(maxsize=None)
+def module_suite(module_name):
+    """
+    Load the tests of an already-imported module once and reuse the suite.
+
+    Args:
+        module_name (str): Name of the module in sys.modules
+
+    Returns:
+        unittest.TestSuite: Suite of all tests in the module
+    """
+    loader = unittest.TestLoader()
+    loader.suiteClass = _ReusableSuite
+    return loader.loadTestsFromModule(sys.modules[module_name])
@@ -0,0 +1,28 @@
+"""
+Pytest Configuration for MoneyPrinter V2 Tests
+
+The suite can run in parallel with pytest-xdist (`pytest -n auto tests`).
+Each xdist worker is its own process, and test_cache/test_utils point
+config.ROOT_DIR at a fresh per-worker directory from make_test_dir() when
+they are imported, so workers never share cache or temp files.
+
+Importing _helpers here also puts src/ on sys.path once, before any test
+module is collected.
+
+ROOT_DIR is set at import rather than in a fixture because cache_fixed and
+utils_fixed bind it when they are first imported, before any fixture runs.
+
+Author: MoneyPrinter V2 Team
+License: AGPL-3.0
+"""
+
+import pytest
+
+from _helpers import remove_test_dirs
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _remove_test_dirs():
+    """Remove this worker's test directories when the session ends"""
+    yield
+    remove_test_dirs()
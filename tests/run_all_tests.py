@@ -3,6 +3,10 @@ Test Runner for MoneyPrinter V2
 
 Runs all unit tests and generates a comprehensive test report.
 
+The suite is small enough that it runs fastest serially in this process.
+To spread it across cores, use pytest-xdist instead
+(`python -m pytest -n auto tests`).
+
 Usage:
     python tests/run_all_tests.py
 
@@ -14,14 +18,17 @@ import unittest
 import sys
 import os
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Puts src/ on sys.path
+import _helpers  # noqa: F401
 
 
 def discover_and_run_tests():
     """
     Discover and run all tests in the tests directory.
 
+    A test module that fails to import shows up as a single erroring
+    test, so one broken module can't take the whole run down.
+
     Returns:
         bool: True if all tests passed, False otherwise
     """
@@ -32,7 +39,7 @@ def discover_and_run_tests():
 
     # Discover all tests in the tests directory
     loader = unittest.TestLoader()
-    start_dir = os.path.dirname(__file__)
+    start_dir = os.path.dirname(os.path.abspath(__file__))
     suite = loader.discover(start_dir, pattern='test_*.py')
 
     # Run tests with detailed output
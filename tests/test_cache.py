@@ -11,26 +11,29 @@ import unittest
 import os
 import sys
 import json
-import tempfile
-import shutil
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Importing _helpers also puts src/ on sys.path
+from _helpers import make_test_dir, module_suite, fast_rmtree
 
-# Mock ROOT_DIR for testing
+# Mock ROOT_DIR for testing (in memory where possible)
 import config
-test_root = tempfile.mkdtemp()
+test_root = make_test_dir()
 config.ROOT_DIR = test_root
 
 from cache_fixed import (
     get_cache_path,
+    get_twitter_cache_path,
     get_accounts,
     add_account,
+    bulk_add_accounts,
     remove_account,
     update_account,
     get_products,
     add_product,
-    clear_cache
+    bulk_add_products,
+    clear_cache,
+    snapshot_cache,
+    restore_cache
 )
 
 
@@ -47,55 +50,57 @@ class TestCachePaths(unittest.TestCase):
 class TestAccountManagement(unittest.TestCase):
     """Test account CRUD operations"""
 
-    def setUp(self):
-        """Set up test environment before each test"""
+    @classmethod
+    def setUpClass(cls):
+        """Start from empty caches and remember that state"""
         clear_cache()
+        cls.snapshot = snapshot_cache()
 
-    def tearDown(self):
-        """Clean up after each test"""
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after the last test"""
         clear_cache()
 
+    def setUp(self):
+        """Roll back whatever the previous test changed"""
+        restore_cache(self.snapshot)
+
     def test_get_accounts_empty(self):
         """Test getting accounts when none exist"""
         accounts = get_accounts("twitter")
         self.assertIsInstance(accounts, list)
         self.assertEqual(len(accounts), 0)
 
-    def test_add_account_twitter(self):
-        """Test adding a Twitter account"""
-        test_account = {
-            "id": "test-uuid-123",
-            "nickname": "Test Account",
-            "firefox_profile": "/path/to/profile",
-            "topic": "Technology"
-        }
-
-        result = add_account("twitter", test_account)
-        self.assertTrue(result)
-
-        # Verify account was added
-        accounts = get_accounts("twitter")
-        self.assertEqual(len(accounts), 1)
-        self.assertEqual(accounts[0]["id"], "test-uuid-123")
-        self.assertEqual(accounts[0]["nickname"], "Test Account")
+    def test_add_account(self):
+        """Test adding an account for each provider and reading it back"""
+        cases = [
+            ("twitter", {
+                "id": "test-uuid-123",
+                "nickname": "Test Account",
+                "firefox_profile": "/path/to/profile",
+                "topic": "Technology"
+            }, "nickname", "Test Account"),
+            ("youtube", {
+                "id": "test-uuid-456",
+                "nickname": "My Channel",
+                "firefox_profile": "/path/to/profile",
+                "niche": "Gaming",
+                "language": "English"
+            }, "niche", "Gaming"),
+        ]
 
-    def test_add_account_youtube(self):
-        """Test adding a YouTube account"""
-        test_account = {
-            "id": "test-uuid-456",
-            "nickname": "My Channel",
-            "firefox_profile": "/path/to/profile",
-            "niche": "Gaming",
-            "language": "English"
-        }
+        for provider, test_account, field, expected in cases:
+            with self.subTest(provider=provider):
+                restore_cache(self.snapshot)
 
-        result = add_account("youtube", test_account)
-        self.assertTrue(result)
+                result = add_account(provider, test_account)
+                self.assertTrue(result)
 
-        # Verify account was added
-        accounts = get_accounts("youtube")
-        self.assertEqual(len(accounts), 1)
-        self.assertEqual(accounts[0]["niche"], "Gaming")
+                # Verify account was added
+                accounts = get_accounts(provider)
+                self.assertEqual(len(accounts), 1)
+                self.assertEqual(accounts[0]["id"], test_account["id"])
+                self.assertEqual(accounts[0][field], expected)
 
     def test_add_duplicate_account(self):
         """Test adding duplicate account (should fail)"""
@@ -104,17 +109,21 @@ class TestAccountManagement(unittest.TestCase):
             "nickname": "Test Account"
         }
 
-        # Add first time
-        result1 = add_account("twitter", test_account)
-        self.assertTrue(result1)
+        for provider in ("twitter", "youtube"):
+            with self.subTest(provider=provider):
+                restore_cache(self.snapshot)
 
-        # Try to add again (should fail)
-        result2 = add_account("twitter", test_account)
-        self.assertFalse(result2)
+                # Add first time
+                result1 = add_account(provider, test_account)
+                self.assertTrue(result1)
 
-        # Should still only have one account
-        accounts = get_accounts("twitter")
-        self.assertEqual(len(accounts), 1)
+                # Try to add again (should fail)
+                result2 = add_account(provider, test_account)
+                self.assertFalse(result2)
+
+                # Should still only have one account
+                accounts = get_accounts(provider)
+                self.assertEqual(len(accounts), 1)
 
     def test_remove_account(self):
         """Test removing an account"""
@@ -186,17 +195,48 @@ class TestAccountManagement(unittest.TestCase):
         with self.assertRaises(ValueError):
             add_account("twitter", invalid_account)
 
+    def test_bulk_add_accounts(self):
+        """Test adding several accounts at once, skipping duplicates"""
+        add_account("youtube", {"id": "acc-1", "nickname": "Existing"})
+
+        added = bulk_add_accounts("youtube", [
+            {"id": "acc-1", "nickname": "Duplicate of stored"},
+            {"id": "acc-2", "nickname": "Account 2"},
+            {"id": "acc-3", "nickname": "Account 3"},
+            {"id": "acc-2", "nickname": "Duplicate within batch"}
+        ])
+        self.assertEqual(added, 2)
+
+        accounts = get_accounts("youtube")
+        self.assertEqual([acc["id"] for acc in accounts], ["acc-1", "acc-2", "acc-3"])
+        self.assertEqual(accounts[0]["nickname"], "Existing")
+        self.assertEqual(accounts[1]["nickname"], "Account 2")
+
+    def test_bulk_add_accounts_rejects_malformed(self):
+        """Test that a malformed entry aborts the whole batch"""
+        with self.assertRaises(ValueError):
+            bulk_add_accounts("twitter", [{"id": "acc-1"}, {"nickname": "No ID"}])
+
+        self.assertEqual(len(get_accounts("twitter")), 0)
+
 
 class TestProductManagement(unittest.TestCase):
     """Test affiliate product management"""
 
-    def setUp(self):
-        """Set up test environment"""
-        clear_cache("afm")
+    @classmethod
+    def setUpClass(cls):
+        """Start from empty caches and remember that state"""
+        clear_cache()
+        cls.snapshot = snapshot_cache()
 
-    def tearDown(self):
-        """Clean up after tests"""
-        clear_cache("afm")
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after the last test"""
+        clear_cache()
+
+    def setUp(self):
+        """Roll back whatever the previous test changed"""
+        restore_cache(self.snapshot)
 
     def test_get_products_empty(self):
         """Test getting products when none exist"""
@@ -239,27 +279,93 @@ class TestProductManagement(unittest.TestCase):
         products = get_products()
         self.assertEqual(len(products), 1)
 
+    def test_bulk_add_products(self):
+        """Test adding several products at once"""
+        added = bulk_add_products([
+            {"id": "product-1", "affiliate_link": "https://amazon.com/1"},
+            {"id": "product-2", "affiliate_link": "https://amazon.com/2"},
+            {"id": "product-1", "affiliate_link": "https://amazon.com/dup"}
+        ])
+        self.assertEqual(added, 2)
+
+        products = get_products()
+        self.assertEqual([p["id"] for p in products], ["product-1", "product-2"])
 
-class TestCachePersistence(unittest.TestCase):
-    """Test that cache persists across operations"""
+
+class TestSnapshotRestore(unittest.TestCase):
+    """Test rolling the cache back to a snapshot"""
 
     def setUp(self):
         """Set up test environment"""
         clear_cache()
 
+    def tearDown(self):
+        """Clean up after tests"""
+        clear_cache()
+
+    def test_restore_rolls_back_changes(self):
+        """Test that additions, removals and corruption are all undone"""
+        add_account("twitter", {"id": "keep"})
+        snapshot = snapshot_cache()
+
+        add_account("twitter", {"id": "extra"})
+        remove_account("twitter", "keep")
+        add_product({"id": "product-1"})
+        with open(get_twitter_cache_path(), "w", encoding="utf-8") as f:
+            f.write("{not valid json")
+
+        self.assertTrue(restore_cache(snapshot))
+        self.assertEqual([acc["id"] for acc in get_accounts("twitter")], ["keep"])
+        self.assertEqual(get_products(), [])
+
+    def test_restore_skips_unchanged_files(self):
+        """Test that files matching the snapshot are not rewritten"""
+        snapshot = snapshot_cache()
+        before = os.stat(get_twitter_cache_path()).st_mtime_ns
+
+        add_product({"id": "product-1"})
+        restore_cache(snapshot)
+
+        self.assertEqual(os.stat(get_twitter_cache_path()).st_mtime_ns, before)
+        self.assertEqual(get_products(), [])
+
+
+class TestCachePersistence(unittest.TestCase):
+    """Test that cache persists across operations"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start from empty caches and remember that state"""
+        clear_cache()
+        cls.snapshot = snapshot_cache()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up after the last test"""
+        clear_cache()
+
+    def setUp(self):
+        """Roll back whatever the previous test changed"""
+        restore_cache(self.snapshot)
+
     def test_cache_persists(self):
         """Test that cache data persists"""
-        # Add account
         test_account = {
             "id": "persist-test",
             "nickname": "Persist Test"
         }
-        add_account("twitter", test_account)
 
-        # Get accounts again (simulating new session)
-        accounts = get_accounts("twitter")
-        self.assertEqual(len(accounts), 1)
-        self.assertEqual(accounts[0]["id"], "persist-test")
+        for provider in ("twitter", "youtube"):
+            with self.subTest(provider=provider):
+                restore_cache(self.snapshot)
+
+                # Add account
+                add_account(provider, test_account)
+
+                # Get accounts again (simulating new session)
+                accounts = get_accounts(provider)
+                self.assertEqual(len(accounts), 1)
+                self.assertEqual(accounts[0]["id"], "persist-test")
 
     def test_multiple_accounts_persist(self):
         """Test multiple accounts persist correctly"""
@@ -281,18 +387,47 @@ class TestCachePersistence(unittest.TestCase):
         self.assertIn("acc-2", stored_ids)
         self.assertIn("acc-3", stored_ids)
 
+    def test_external_edit_is_picked_up(self):
+        """Test that changes made to the file on disk are picked up by the next read"""
+        add_account("twitter", {"id": "acc-1", "nickname": "Account 1"})
+        self.assertEqual(len(get_accounts("twitter")), 1)
+
+        # Simulate another process rewriting the cache file
+        with open(get_twitter_cache_path(), "w", encoding="utf-8") as f:
+            json.dump({"accounts": [{"id": "acc-2"}, {"id": "acc-3"}]}, f)
+
+        stored_ids = [acc["id"] for acc in get_accounts("twitter")]
+        self.assertEqual(stored_ids, ["acc-2", "acc-3"])
+
+    def test_corrupted_file_falls_back_to_default(self):
+        """Test that a corrupted cache file is treated as empty without sharing state"""
+        for _ in range(2):
+            with open(get_twitter_cache_path(), "w", encoding="utf-8") as f:
+                f.write("{not valid json")
+
+            # Mutating the fallback must not leak into the next fallback
+            accounts = get_accounts("twitter")
+            self.assertEqual(accounts, [])
+            accounts.append({"id": "leaked"})
+
+    def test_returned_accounts_are_copies(self):
+        """Test that mutating a returned account does not leak into later reads"""
+        add_account("twitter", {"id": "acc-1", "nickname": "Account 1"})
+
+        get_accounts("twitter")[0]["nickname"] = "Mutated"
+
+        self.assertEqual(get_accounts("twitter")[0]["nickname"], "Account 1")
+
 
 def cleanup():
     """Clean up test environment"""
-    if os.path.exists(test_root):
-        shutil.rmtree(test_root)
+    fast_rmtree(test_root)
 
 
 def run_tests():
     """Run all tests"""
     try:
-        loader = unittest.TestLoader()
-        suite = loader.loadTestsFromModule(sys.modules[__name__])
+        suite = module_suite(__name__)
         runner = unittest.TextTestRunner(verbosity=2)
         result = runner.run(suite)
         return result.wasSuccessful()
@@ -8,21 +8,41 @@ License: AGPL-3.0
 """
 
 import unittest
+import io
+import re
 import platform
 import sys
 import os
+import stat
+import tempfile
+from unittest import mock
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Importing _helpers also puts src/ on sys.path
+from _helpers import module_suite, fast_rmtree
 
 from platform_utils import (
     PlatformDetector,
     ProcessManager,
     DependencyChecker,
-    PathResolver
+    PathResolver,
+    clear_dependency_cache,
+    _OS_RELEASE_RE
 )
 
 
+# Dotted major.minor.micro version string
+_VERSION_RE = re.compile(r'\d+\.\d+\.\d+')
+
+
+def _make_executable(directory, name, content=b""):
+    """Create an executable file named like a command on the current platform"""
+    path = os.path.join(directory, name + (".exe" if PlatformDetector.is_windows() else ""))
+    with open(path, "wb") as f:
+        f.write(content)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
 class TestPlatformDetector(unittest.TestCase):
     """Test cases for PlatformDetector class"""
 
@@ -64,15 +84,40 @@ class TestPlatformDetector(unittest.TestCase):
             self.assertEqual(info, {})
 
 
+class TestOsReleaseParsing(unittest.TestCase):
+    """Test parsing of /etc/os-release contents"""
+
+    def test_whitespace_and_line_endings(self):
+        """Test that surrounding whitespace and CRLF endings don't leak into values"""
+        content = 'NAME="Ubuntu"  \r\n  ID=ubuntu\t\nVERSION_ID=\'22.04\'\r\nPRETTY_NAME="Ubuntu 22.04 LTS"\n'
+        parsed = {m.group(1): m.group(3) for m in _OS_RELEASE_RE.finditer(content)}
+        self.assertEqual(parsed, {
+            "NAME": "Ubuntu",
+            "ID": "ubuntu",
+            "VERSION_ID": "22.04",
+            "PRETTY_NAME": "Ubuntu 22.04 LTS",
+        })
+
+
 class TestDependencyChecker(unittest.TestCase):
     """Test cases for DependencyChecker class"""
 
+    @classmethod
+    def setUpClass(cls):
+        """Run the real-environment checks once for the tests that inspect them"""
+        clear_dependency_cache()
+        cls.python_check = DependencyChecker.check_python_version()
+        cls.imagemagick_check = DependencyChecker.check_imagemagick()
+        cls.firefox_check = DependencyChecker.check_firefox()
+        cls.go_check = DependencyChecker.check_go()
+        cls.report = DependencyChecker.get_dependency_report()
+
     def test_python_version_check(self):
         """Test Python version validation"""
-        is_valid, version_str = DependencyChecker.check_python_version()
+        is_valid, version_str = self.python_check
         self.assertIsInstance(is_valid, bool)
         self.assertIsInstance(version_str, str)
-        self.assertRegex(version_str, r'\d+\.\d+\.\d+')
+        self.assertRegex(version_str, _VERSION_RE)
 
         # Since we're running this test, Python must be installed
         version = sys.version_info
@@ -88,9 +133,30 @@ class TestDependencyChecker(unittest.TestCase):
         # Non-existent command should return False
         self.assertFalse(DependencyChecker.check_command_exists("this_command_does_not_exist_xyz"))
 
+    def test_clear_dependency_cache(self):
+        """Test that lookups are memoized until the cache is cleared"""
+        tool_dir = tempfile.mkdtemp()
+        tool_name = "mp_fake_tool_xyz"
+        _make_executable(tool_dir, tool_name)
+
+        original_path = os.environ.get("PATH", "")
+        try:
+            self.assertFalse(DependencyChecker.check_command_exists(tool_name))
+
+            # PATH changes are not seen until the cache is cleared
+            os.environ["PATH"] = tool_dir + os.pathsep + original_path
+            self.assertFalse(DependencyChecker.check_command_exists(tool_name))
+
+            clear_dependency_cache()
+            self.assertTrue(DependencyChecker.check_command_exists(tool_name))
+        finally:
+            os.environ["PATH"] = original_path
+            clear_dependency_cache()
+            fast_rmtree(tool_dir)
+
     def test_dependency_report_structure(self):
         """Test dependency report structure"""
-        report = DependencyChecker.get_dependency_report()
+        report = self.report
 
         self.assertIsInstance(report, dict)
         self.assertIn("python", report)
@@ -104,9 +170,35 @@ class TestDependencyChecker(unittest.TestCase):
             self.assertIn("installed", dep_info)
             self.assertIn("critical", dep_info)
 
+    def test_dependency_report_is_reused(self):
+        """Test that a recent report is reused until the cache is cleared"""
+        clear_dependency_cache()
+        with mock.patch.object(DependencyChecker, "check_go", return_value=(False, None)) as check_go:
+            first = DependencyChecker.get_dependency_report()
+            first["go"]["installed"] = "mutated"
+            second = DependencyChecker.get_dependency_report()
+            self.assertEqual(check_go.call_count, 1)
+            self.assertIs(second["go"]["installed"], False)
+
+            clear_dependency_cache()
+            DependencyChecker.get_dependency_report()
+            self.assertEqual(check_go.call_count, 2)
+        clear_dependency_cache()
+
+    def test_print_dependency_report_single_write(self):
+        """Test that the printed report is emitted in one write"""
+        with mock.patch.object(sys, "stdout", new_callable=io.StringIO) as stdout:
+            with mock.patch.object(stdout, "write", wraps=stdout.write) as write:
+                result = DependencyChecker.print_dependency_report()
+
+        self.assertIsInstance(result, bool)
+        self.assertEqual(write.call_count, 1)
+        self.assertIn("SYSTEM DEPENDENCY CHECK", stdout.getvalue())
+        self.assertIn("PYTHON", stdout.getvalue())
+
     def test_imagemagick_check(self):
         """Test ImageMagick detection"""
-        is_installed, path = DependencyChecker.check_imagemagick()
+        is_installed, path = self.imagemagick_check
         self.assertIsInstance(is_installed, bool)
         if is_installed:
             self.assertIsInstance(path, str)
@@ -117,7 +209,7 @@ class TestDependencyChecker(unittest.TestCase):
 
     def test_firefox_check(self):
         """Test Firefox detection"""
-        is_installed, path = DependencyChecker.check_firefox()
+        is_installed, path = self.firefox_check
         self.assertIsInstance(is_installed, bool)
         if is_installed:
             self.assertIsInstance(path, str)
@@ -125,7 +217,7 @@ class TestDependencyChecker(unittest.TestCase):
 
     def test_go_check(self):
         """Test Go programming language detection"""
-        is_installed, version = DependencyChecker.check_go()
+        is_installed, version = self.go_check
         self.assertIsInstance(is_installed, bool)
         if is_installed:
             self.assertIsInstance(version, str)
@@ -156,25 +248,56 @@ class TestPathResolver(unittest.TestCase):
             self.assertFalse(normalized.startswith("~"))
             self.assertTrue(os.path.isabs(normalized))
 
+    def test_normalize_path_follows_cwd_and_env(self):
+        """Test that memoized expansion still honours cwd and env changes"""
+        original_cwd = os.getcwd()
+        first_dir = tempfile.mkdtemp()
+        second_dir = tempfile.mkdtemp()
+        try:
+            for directory in (first_dir, second_dir):
+                os.chdir(directory)
+                self.assertEqual(
+                    PathResolver.normalize_path("test"),
+                    os.path.join(os.getcwd(), "test")
+                )
+
+            os.environ["MP_TEST_PATH_VAR"] = first_dir
+            self.assertEqual(PathResolver.normalize_path("$MP_TEST_PATH_VAR/x"), os.path.join(first_dir, "x"))
+            os.environ["MP_TEST_PATH_VAR"] = second_dir
+            self.assertEqual(PathResolver.normalize_path("$MP_TEST_PATH_VAR/x"), os.path.join(second_dir, "x"))
+        finally:
+            os.chdir(original_cwd)
+            os.environ.pop("MP_TEST_PATH_VAR", None)
+            fast_rmtree(first_dir)
+            fast_rmtree(second_dir)
+
+
+# ProcessManager needs taskkill (Windows), /proc (Linux) or pkill to do anything
+_CAN_KILL_PROCESSES = (
+    PlatformDetector.is_windows()
+    or os.path.isdir("/proc")
+    or DependencyChecker.check_command_exists("pkill")
+)
+
 
+@unittest.skipUnless(_CAN_KILL_PROCESSES, "no way to kill processes on this platform")
 class TestProcessManager(unittest.TestCase):
     """Test cases for ProcessManager class"""
 
-    def test_kill_firefox_returns_bool(self):
-        """Test that kill_firefox_instances returns boolean"""
-        result = ProcessManager.kill_firefox_instances()
-        self.assertIsInstance(result, bool)
-
-    def test_kill_process_returns_bool(self):
-        """Test that kill_process_by_name returns boolean"""
-        result = ProcessManager.kill_process_by_name("nonexistent_process")
-        self.assertIsInstance(result, bool)
+    def test_kill_returns_bool(self):
+        """Test that kill_firefox_instances and kill_process_by_name return booleans"""
+        calls = [
+            ("kill_firefox_instances", ProcessManager.kill_firefox_instances),
+            ("kill_process_by_name", lambda: ProcessManager.kill_process_by_name("nonexistent_process")),
+        ]
+        for name, kill in calls:
+            with self.subTest(method=name):
+                self.assertIsInstance(kill(), bool)
 
 
 def run_tests():
     """Run all tests and return results"""
-    loader = unittest.TestLoader()
-    suite = loader.loadTestsFromModule(sys.modules[__name__])
+    suite = module_suite(__name__)
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
     return result.wasSuccessful()
@@ -9,21 +9,25 @@ License: AGPL-3.0
 """
 
 import unittest
+import io
 import os
 import sys
-import tempfile
-import shutil
+import zipfile
+from unittest import mock
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Importing _helpers also puts src/ on sys.path
+from _helpers import make_test_dir, module_suite, fast_rmtree
 
-# Mock ROOT_DIR for testing
+# Mock ROOT_DIR for testing (in memory where possible)
 import config
-test_root = tempfile.mkdtemp()
+test_root = make_test_dir()
 config.ROOT_DIR = test_root
 
+import utils_fixed
 from utils_fixed import (
     build_url,
+    fetch_songs,
+    choose_random_song,
     rem_temp_files,
     validate_file_exists,
     ensure_directory_exists
@@ -51,6 +55,23 @@ class TestBuildUrl(unittest.TestCase):
             build_url(None)
 
 
+def _make_files(directory, names, payload=b"test"):
+    """Create small files in a directory with raw os.open/os.write calls"""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    for name in names:
+        fd = os.open(os.path.join(directory, name), flags, 0o600)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+
+
+def _present(directory):
+    """Names of everything in a directory, from a single scandir pass"""
+    with os.scandir(directory) as entries:
+        return frozenset(entry.name for entry in entries)
+
+
 class TestRemTempFiles(unittest.TestCase):
     """Test temporary file removal"""
 
@@ -61,8 +82,7 @@ class TestRemTempFiles(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test environment"""
-        if os.path.exists(self.mp_dir):
-            shutil.rmtree(self.mp_dir)
+        fast_rmtree(self.mp_dir)
 
     def test_rem_temp_files_empty_dir(self):
         """Test removing files from empty directory"""
@@ -72,10 +92,7 @@ class TestRemTempFiles(unittest.TestCase):
     def test_rem_temp_files_with_files(self):
         """Test removing temporary files"""
         # Create test files
-        test_files = ["temp1.mp4", "temp2.wav", "cache.json"]
-        for filename in test_files:
-            with open(os.path.join(self.mp_dir, filename), "w") as f:
-                f.write("test")
+        _make_files(self.mp_dir, ["temp1.mp4", "temp2.wav", "cache.json"])
 
         # Remove temp files
         count = rem_temp_files()
@@ -83,53 +100,190 @@ class TestRemTempFiles(unittest.TestCase):
         # Should remove 2 files (not the JSON)
         self.assertEqual(count, 2)
 
+        present = _present(self.mp_dir)
+
         # JSON file should still exist
-        self.assertTrue(os.path.exists(os.path.join(self.mp_dir, "cache.json")))
+        self.assertIn("cache.json", present)
 
         # Other files should be gone
-        self.assertFalse(os.path.exists(os.path.join(self.mp_dir, "temp1.mp4")))
-        self.assertFalse(os.path.exists(os.path.join(self.mp_dir, "temp2.wav")))
+        self.assertNotIn("temp1.mp4", present)
+        self.assertNotIn("temp2.wav", present)
 
     def test_rem_temp_files_preserves_json(self):
         """Test that JSON files are preserved"""
         # Create JSON files
         json_files = ["cache.json", "config.json", "data.json"]
-        for filename in json_files:
-            with open(os.path.join(self.mp_dir, filename), "w") as f:
-                f.write("{}")
+        _make_files(self.mp_dir, json_files, b"{}")
 
         # Remove temp files
         count = rem_temp_files()
         self.assertEqual(count, 0)
 
         # All JSON files should still exist
+        present = _present(self.mp_dir)
         for filename in json_files:
-            self.assertTrue(os.path.exists(os.path.join(self.mp_dir, filename)))
+            self.assertIn(filename, present)
+
+    def test_rem_temp_files_reports_failure_reason(self):
+        """Test that a file that can't be removed is reported with the reason"""
+        _make_files(self.mp_dir, ["locked.mp4"])
+
+        with mock.patch.object(utils_fixed, "get_verbose", return_value=True), \
+                mock.patch.object(utils_fixed, "warning") as warning, \
+                mock.patch.object(utils_fixed.os, "remove", side_effect=PermissionError("access denied")):
+            self.assertEqual(rem_temp_files(), 0)
+
+        warning.assert_called_once_with(" => Could not remove locked.mp4: access denied")
 
     def test_rem_temp_files_nonexistent_dir(self):
         """Test removing files when directory doesn't exist"""
         # Remove the directory
-        shutil.rmtree(self.mp_dir)
+        fast_rmtree(self.mp_dir)
 
         # Should return 0 without crashing
         count = rem_temp_files()
         self.assertEqual(count, 0)
 
 
+def _make_zip(files):
+    """Build an in-memory ZIP archive from a {name: content} mapping"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+class _FakeResponse:
+    """Minimal stand-in for a streamed requests.Response"""
+
+    def __init__(self, body, status_code=200, headers=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers if headers is not None else {"Content-Length": str(len(body))}
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class TestFetchSongs(unittest.TestCase):
+    """Test background music download (network mocked)"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.songs_dir = os.path.join(test_root, "Songs")
+        patches = [
+            mock.patch.object(utils_fixed, "get_verbose", return_value=False),
+            mock.patch.object(utils_fixed, "get_zip_url", return_value="https://example.com/songs.zip"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        fast_rmtree(self.songs_dir)
+
+    def test_fetch_songs_extracts_archive(self):
+        """Test that the downloaded archive is extracted into Songs/"""
+        body = _make_zip({"song1.mp3": b"a" * 100, "song2.wav": b"b" * 100})
+        with mock.patch.object(utils_fixed.requests, "get", return_value=_FakeResponse(body)):
+            self.assertTrue(fetch_songs())
+
+        self.assertEqual(sorted(os.listdir(self.songs_dir)), ["song1.mp3", "song2.wav"])
+
+    def test_fetch_songs_unknown_length(self):
+        """Test extraction when the server doesn't send Content-Length"""
+        body = _make_zip({"song1.mp3": b"a" * 100})
+        response = _FakeResponse(body, headers={})
+        with mock.patch.object(utils_fixed.requests, "get", return_value=response):
+            self.assertTrue(fetch_songs())
+
+        self.assertEqual(os.listdir(self.songs_dir), ["song1.mp3"])
+
+    def test_fetch_songs_skips_when_present(self):
+        """Test that no download happens when songs already exist"""
+        os.makedirs(self.songs_dir)
+        with open(os.path.join(self.songs_dir, "existing.mp3"), "wb") as f:
+            f.write(b"x")
+
+        with mock.patch.object(utils_fixed.requests, "get") as get:
+            self.assertTrue(fetch_songs())
+        get.assert_not_called()
+
+    def test_fetch_songs_bad_zip(self):
+        """Test that an invalid archive is reported and nothing is extracted"""
+        with mock.patch.object(utils_fixed.requests, "get", return_value=_FakeResponse(b"not a zip")):
+            self.assertFalse(fetch_songs())
+
+        self.assertEqual(os.listdir(self.songs_dir), [])
+
+    def test_fetch_songs_corrupted_member(self):
+        """Test that a CRC mismatch aborts before any file is extracted"""
+        body = _make_zip({"song1.mp3": b"a" * 100, "song2.mp3": b"b" * 100})
+        body = body.replace(b"b" * 100, b"c" * 100)
+        with mock.patch.object(utils_fixed.requests, "get", return_value=_FakeResponse(body)):
+            self.assertFalse(fetch_songs())
+
+        self.assertEqual(os.listdir(self.songs_dir), [])
+
+
+class TestChooseRandomSong(unittest.TestCase):
+    """Test background music selection"""
+
+    def setUp(self):
+        """Set up test environment"""
+        self.songs_dir = os.path.join(test_root, "Songs")
+        os.makedirs(self.songs_dir)
+        patcher = mock.patch.object(utils_fixed, "get_verbose", return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test environment"""
+        fast_rmtree(self.songs_dir)
+
+    def test_no_songs(self):
+        """Test that None is returned when there is nothing to choose from"""
+        os.makedirs(os.path.join(self.songs_dir, "not_a_song.mp3"))
+        _make_files(self.songs_dir, ["notes.txt"])
+
+        self.assertIsNone(choose_random_song())
+
+    def test_chooses_every_song(self):
+        """Test that only audio files are chosen and each of them can be"""
+        songs = ["a.mp3", "b.wav", "c.ogg"]
+        _make_files(self.songs_dir, songs + ["cover.jpg"])
+
+        chosen = {choose_random_song() for _ in range(200)}
+        self.assertEqual(chosen, {os.path.join(self.songs_dir, name) for name in songs})
+
+
 class TestValidateFileExists(unittest.TestCase):
     """Test file validation"""
 
     def setUp(self):
         """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
+        self.test_dir = make_test_dir()
         self.test_file = os.path.join(self.test_dir, "test.txt")
-        with open(self.test_file, "w") as f:
-            f.write("test content")
+        _make_files(self.test_dir, ["test.txt"], b"test content")
 
     def tearDown(self):
         """Clean up test environment"""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir)
+        fast_rmtree(self.test_dir)
 
     def test_validate_existing_file(self):
         """Test validating an existing file"""
@@ -141,6 +295,11 @@ class TestValidateFileExists(unittest.TestCase):
         result = validate_file_exists("/nonexistent/file.txt", "Test file")
         self.assertFalse(result)
 
+    def test_validate_path_with_nul_byte(self):
+        """Test that an unusable path is reported as missing instead of raising"""
+        result = validate_file_exists(self.test_file + "\0", "Test file")
+        self.assertFalse(result)
+
     def test_validate_directory_as_file(self):
         """Test validating a directory (should fail)"""
         result = validate_file_exists(self.test_dir, "Test directory")
@@ -152,13 +311,12 @@ class TestEnsureDirectoryExists(unittest.TestCase):
 
     def setUp(self):
         """Set up test environment"""
-        self.test_root = tempfile.mkdtemp()
+        self.test_root = make_test_dir()
         self.test_dir = os.path.join(self.test_root, "test_subdir")
 
     def tearDown(self):
         """Clean up test environment"""
-        if os.path.exists(self.test_root):
-            shutil.rmtree(self.test_root)
+        fast_rmtree(self.test_root)
 
     def test_ensure_directory_creates_new(self):
         """Test creating a new directory"""
@@ -187,15 +345,13 @@ class TestEnsureDirectoryExists(unittest.TestCase):
 
 def cleanup():
     """Clean up test environment"""
-    if os.path.exists(test_root):
-        shutil.rmtree(test_root)
+    fast_rmtree(test_root)
 
 
 def run_tests():
     """Run all tests"""
     try:
-        loader = unittest.TestLoader()
-        suite = loader.loadTestsFromModule(sys.modules[__name__])
+        suite = module_suite(__name__)
         runner = unittest.TextTestRunner(verbosity=2)
         result = runner.run(suite)
         return result.wasSuccessful()